@@ -20,6 +20,7 @@ from dash import dcc, html
 # The "layouts" file has functions for setting up different parts of our app's appearance.
 from utils import generate_new_puzzle, next_color, compute_color_sums, is_puzzle_solved, COLORS_TO_CSS
 from utils import create_sums, create_cells, create_game_board_with_sums
+from difficulty import load_index, draw_puzzle, available_difficulties, UNGRADED
 
 
 
@@ -31,6 +32,37 @@ def register_callbacks(app):
     Input property changes. These functions are automatically called by Dash 
     whenever an input property changes.
     """
+    # The difficulty-graded puzzles are built offline (see difficulty.py), so starting
+    # a game only needs a lookup in this index.
+    puzzle_index = load_index()
+
+    @app.callback(
+        [
+            Output('difficulty-dropdown', 'options'),   # Output: Difficulties offered for the selected board size
+            Output('difficulty-dropdown', 'value'),     # Output: Selected difficulty
+        ],
+        Input('board-size-dropdown', 'value'),          # Input: Callback triggered by a change of the board size
+        State('difficulty-dropdown', 'value'),          # State: Currently selected difficulty
+    )
+    def update_difficulty_options(board_size, difficulty):
+        """
+        Offers only the difficulties for which the index holds puzzles of the selected size.
+
+        Parameters:
+            - board_size (int): The size of the game board selected by the user.
+            - difficulty (str): The currently selected difficulty.
+
+        Returns:
+            - tuple: The options of the difficulty dropdown and the selected difficulty.
+        """
+        difficulties = available_difficulties(puzzle_index, board_size)
+        if not difficulties:
+            # Without graded puzzles for this size, say so and generate puzzles on demand.
+            return [{'label': 'Ungraded', 'value': UNGRADED}], UNGRADED
+        options = [{'label': d.capitalize(), 'value': d} for d in difficulties]
+        if difficulty not in difficulties:
+            difficulty = 'medium' if 'medium' in difficulties else difficulties[0]
+        return options, difficulty
 
     @app.callback(
         Output('game-board-placeholder', 'children'),  # Output: Updated game board rendered in 'children' property of 'game-board-placeholder' component
@@ -75,9 +107,10 @@ def register_callbacks(app):
             State({"type": "cell", "index": ALL}, "id"),            # State: Ids of the cells
             State('puzzle-store', 'data'),                          # State: Data stored in the puzzle store
             State('board-size-dropdown', 'value'),                  # State: value of k (board size)
+            State('difficulty-dropdown', 'value'),                  # State: selected difficulty
         ]
     )
-    def update_puzzle_store(start_clicks, show_answer_clicks, cell_n_clicks, close_clicks, cell_ids, puzzle_store, k):
+    def update_puzzle_store(start_clicks, show_answer_clicks, cell_n_clicks, close_clicks, cell_ids, puzzle_store, k, difficulty):
         """Updates the puzzle store.
 
         This function is responsible for handling the interactions with the puzzle.
@@ -94,6 +127,8 @@ def register_callbacks(app):
             close_clicks (int): Number of times the close button in the modal has been clicked.
             cell_ids (list): List of ids of the cells.
             puzzle_store (dict): The current state of the puzzle store.
+            k (int): The size of the puzzle (k x k).
+            difficulty (str): The selected difficulty of the puzzle.
 
         Returns:
             dict: The updated puzzle store.
@@ -115,7 +150,14 @@ def register_callbacks(app):
             triggering_component_id = trigger["prop_id"].split(".")[0]
             # Initialize or reset the puzzle store when the Start button is clicked
             if triggering_component_id == 'start-button':
-                puzzle_store['cell_colors_true'], puzzle_store['row_sums_true'], puzzle_store['col_sums_true'] = generate_new_puzzle(k)
+                # Draw a puzzle from the index, only ungraded puzzles are generated on demand
+                if difficulty == UNGRADED:
+                    puzzle = generate_new_puzzle(k)
+                else:
+                    puzzle = draw_puzzle(puzzle_index, k, difficulty)
+                if puzzle is None:
+                    raise PreventUpdate
+                puzzle_store['cell_colors_true'], puzzle_store['row_sums_true'], puzzle_store['col_sums_true'] = puzzle
                 puzzle_store['current_color_config'] = ["blank" for _ in range(k*k)]
 
                 return puzzle_store, False
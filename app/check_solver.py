@@ -0,0 +1,66 @@
+# Checks the propagation solver and the parallel solution counter against
+# brute-force enumeration on small random instances. Run it from inside app/ with "python3 check_solver.py".
+import itertools
+import random
+
+from utils import COLORS, compute_color_sums
+from solver import build_lines, count_solutions, rate_puzzle
+from uniqueness import count_solutions_parallel
+
+
+def random_clues(k):
+    """Returns the clues of a random (not necessarily uniquely solvable) k x k board."""
+    color_config = [random.choice(COLORS) for _ in range(k*k)]
+    row_sums = [compute_color_sums(color_config[i*k:(i+1)*k]) for i in range(k)]
+    col_sums = [compute_color_sums(color_config[i::k]) for i in range(k)]
+    return row_sums, col_sums
+
+
+def brute_force_count(row_sums, col_sums):
+    """Counts the solutions of a puzzle by trying every combination of valid rows."""
+    k = len(row_sums)
+    rows = [
+        [row for row in itertools.product(COLORS, repeat=k) if compute_color_sums(list(row)) == list(sums)]
+        for sums in row_sums
+    ]
+    count = 0
+    for board in itertools.product(*rows):
+        color_config = [color for row in board for color in row]
+        if all(compute_color_sums(color_config[i::k]) == list(col_sums[i]) for i in range(k)):
+            count += 1
+    return count
+
+
+def check_solver(k, samples):
+    for _ in range(samples):
+        row_sums, col_sums = random_clues(k)
+        expected = brute_force_count(row_sums, col_sums)
+        found = count_solutions([(1 << len(COLORS)) - 1] * (k*k), build_lines(row_sums, col_sums), len(COLORS))
+        assert found == expected, (row_sums, col_sums, found, expected)
+
+        # Swapping rows and columns gives the same puzzle, so the rating must not change.
+        # Once the search branches, the cell it branches on depends on the cell order,
+        # so only the depth of puzzles solved by propagation alone is compared.
+        stats, transposed = rate_puzzle(row_sums, col_sums), rate_puzzle(col_sums, row_sums)
+        if stats['branches'] == 0:
+            assert stats['depth'] == transposed['depth'], (row_sums, col_sums)
+        assert stats['solutions'] == min(expected, 2), (row_sums, col_sums)
+
+
+def check_parallel(k, samples):
+    puzzles = [random_clues(k) for _ in range(samples)]
+    expected = [brute_force_count(row_sums, col_sums) for row_sums, col_sums in puzzles]
+    for split_rows in range(1, k + 1):
+        found = count_solutions_parallel(puzzles, limit=10**6, split_rows=split_rows, processes=2)
+        assert found == expected, (split_rows, found, expected)
+    # With a limit, the counts are capped and the early exit must not lose solutions below it
+    found = count_solutions_parallel(puzzles, limit=2, processes=2)
+    assert found == [min(count, 2) for count in expected], (found, expected)
+
+
+if __name__ == '__main__':
+    for k in (2, 3):
+        check_solver(k, 200)
+        print(f"{k}x{k}: solver agrees with brute force")
+        check_parallel(k, 50)
+        print(f"{k}x{k}: parallel counter agrees with brute force")
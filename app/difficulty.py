@@ -0,0 +1,135 @@
+import argparse
+import json
+import os
+import random
+
+from utils import generate_new_puzzle
+from solver import rate_puzzle
+
+# Difficulty buckets, from easiest to hardest
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+# Offered instead when the index holds no puzzles for a board size
+UNGRADED = "ungraded"
+
+# Location of the pre-built puzzle index, shipped next to the app
+INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "puzzle_index.json")
+
+
+def difficulty_bucket(stats, k):
+    """Maps the solver statistics of a puzzle of size k to a difficulty bucket.
+
+    Larger boards need more propagation rounds, so the bounds scale with k: puzzles
+    that need guessing or more than k rounds are 'hard', puzzles solved in at most
+    k/2 rounds are 'easy' and all the others are 'medium'.
+
+    Args:
+        stats (dict): The statistics returned by solver.rate_puzzle.
+        k (int): The size of the puzzle (k x k).
+
+    Returns:
+        Str: One of the DIFFICULTIES.
+    """
+    if stats['branches'] > 0 or stats['depth'] > k:
+        return "hard"
+    if 2*stats['depth'] <= k:
+        return "easy"
+    return "medium"
+
+
+def index_key(k, difficulty):
+    """Returns the key under which puzzles of size k and the given difficulty are stored."""
+    return f"{k}-{difficulty}"
+
+
+def build_index(sizes, count, max_attempts=None):
+    """Generates and rates puzzles until every (size, difficulty) bucket is filled.
+
+    Generated boards that turn out to have more than one solution are dropped.
+    Small boards cannot fill every bucket, e.g. no 2x2 or 3x3 board needs more
+    than k propagation rounds, so a size is given up on after max_attempts boards
+    and the buckets that are still short are reported.
+
+    Args:
+        sizes (list): The board sizes to generate puzzles for.
+        count (int): The number of puzzles to collect per bucket.
+        max_attempts (int): The number of boards to generate per size before giving up
+            (default: 1000 times count).
+
+    Returns:
+        Dict: The puzzle index, mapping index_key(k, difficulty) to a list of puzzles.
+        Buckets without any puzzle are left out.
+    """
+    if max_attempts is None:
+        max_attempts = 1000*count
+
+    index = {index_key(k, difficulty): [] for k in sizes for difficulty in DIFFICULTIES}
+    for k in sizes:
+        for _ in range(max_attempts):
+            if all(len(index[index_key(k, difficulty)]) >= count for difficulty in DIFFICULTIES):
+                break
+            color_config, row_sums, col_sums = generate_new_puzzle(k)
+            stats = rate_puzzle(row_sums, col_sums)
+            if stats['solutions'] != 1:
+                continue
+            bucket = index[index_key(k, difficulty_bucket(stats, k))]
+            if len(bucket) < count:
+                bucket.append({
+                    'color_config': color_config,
+                    'row_sums': row_sums,
+                    'col_sums': col_sums,
+                    'depth': stats['depth'],
+                    'branches': stats['branches'],
+                    'solve_time': stats['solve_time'],
+                })
+
+    for key, puzzles in index.items():
+        if len(puzzles) < count:
+            print(f"Warning: bucket {key} holds only {len(puzzles)} of {count} puzzles")
+    return {key: puzzles for key, puzzles in index.items() if puzzles}
+
+
+def load_index(path=INDEX_PATH):
+    """Loads the puzzle index, or returns an empty index if it has not been built."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def available_difficulties(index, k):
+    """Returns the DIFFICULTIES for which the index holds puzzles of size k."""
+    return [difficulty for difficulty in DIFFICULTIES if index.get(index_key(k, difficulty))]
+
+
+def draw_puzzle(index, k, difficulty):
+    """Draws a random puzzle of size k and the given difficulty from the index.
+
+    Args:
+        index (dict): The puzzle index as returned by load_index.
+        k (int): The size of the puzzle (k x k).
+        difficulty (str): One of the DIFFICULTIES.
+
+    Returns:
+        Tuple: The color configuration, row sums and column sums of the puzzle,
+        or None if the index holds no puzzle for this size and difficulty.
+    """
+    puzzles = index.get(index_key(k, difficulty))
+    if not puzzles:
+        return None
+    puzzle = random.choice(puzzles)
+    return puzzle['color_config'], puzzle['row_sums'], puzzle['col_sums']
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build the difficulty-graded puzzle index.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(range(2, 7)), help="board sizes to generate")
+    parser.add_argument('--count', type=int, default=50, help="puzzles per (size, difficulty) bucket")
+    parser.add_argument('--output', default=INDEX_PATH, help="where to write the index")
+    args = parser.parse_args()
+
+    index = build_index(args.sizes, args.count)
+    with open(args.output, 'w') as f:
+        json.dump(index, f)
+    for key, puzzles in index.items():
+        print(f"{key}: {len(puzzles)} puzzles")
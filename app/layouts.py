@@ -4,6 +4,7 @@
 from dash import html, dcc
 import dash_bootstrap_components as dbc
 import random
+from difficulty import DIFFICULTIES
 
 
 # This function creates an output Div. The output Div is where we will display
@@ -35,13 +36,34 @@ def get_layout():
         className='my-dropdown'
     )
 
-    # Board size selection card
+    # Dropdown for difficulty selection, puzzles are drawn from the pre-built index.
+    # The options are narrowed down to the filled buckets once a board size is chosen.
+    difficulty_dropdown = dcc.Dropdown(
+        id='difficulty-dropdown',
+        options=[{'label': difficulty.capitalize(), 'value': difficulty} for difficulty in DIFFICULTIES],
+        value='medium',  # default value
+        clearable=False,
+        style={
+            'backgroundColor': '#ffffff',
+            'color': 'black',
+            'borderRadius': '5px',
+            'border': '1px solid gray',
+            'padding': '5px',
+            'cursor': 'pointer'
+        },
+        className='my-dropdown'
+    )
+
+    # Board size and difficulty selection card
     board_size_card = dbc.Card(
         [
-            dbc.CardHeader("Choose Grid Size", className="text-center header-style"),
+            dbc.CardHeader("Choose Grid Size and Difficulty", className="text-center header-style"),
             dbc.CardBody(
                 dbc.Row(
-                    dbc.Col(board_size_dropdown, className="mx-auto"),
+                    [
+                        dbc.Col(board_size_dropdown, className="mx-auto"),
+                        dbc.Col(difficulty_dropdown, className="mx-auto"),
+                    ]
                 ),
             ),
         ],
@@ -0,0 +1,140 @@
+import time
+
+### Propagation solver for (row_sums, col_sums) instances
+#
+# Every cell keeps a bitmask of the colors it can still take (bit 0 is
+# 'blank', bits 1.. follow the order of the sums, i.e. COLORS[1:]). A row or
+# column is a "line": a list of cell indices together with the required count
+# of every color in it. The blank count is not part of the clues, it is simply
+# the line length minus the colored cells.
+
+def build_lines(row_sums, col_sums):
+    """Builds the line constraints of a puzzle from its clues.
+
+    Args:
+        row_sums (list): Number of each color (excluding 'blank') in each row.
+        col_sums (list): Number of each color (excluding 'blank') in each column.
+
+    Returns:
+        List: A list of (cells, counts) tuples, one per row followed by one per column,
+        where counts includes the 'blank' count as its first entry.
+    """
+    k = len(row_sums)
+    lines = []
+    for i, sums in enumerate(row_sums):
+        lines.append((list(range(i*k, (i+1)*k)), [k - sum(sums)] + list(sums)))
+    for i, sums in enumerate(col_sums):
+        lines.append((list(range(i, k*k, k)), [k - sum(sums)] + list(sums)))
+    return lines
+
+
+def propagate(domains, lines, n_colors):
+    """Applies the counting rules to every line until nothing changes anymore.
+
+    For each line and color: once the color is fixed in as many cells as required,
+    it is removed from the remaining cells, and once it is possible in only as many
+    cells as required, those cells are fixed to it.
+
+    The rules are applied in rounds. Every line draws its deductions from the domains
+    as they were at the start of the round, and all deductions are applied together at
+    the end of it, so the number of rounds does not depend on the order of the lines.
+
+    Args:
+        domains (list): Bitmask of the possible colors of each cell, updated in place.
+        lines (list): The line constraints as returned by build_lines.
+        n_colors (int): The number of colors, including 'blank'.
+
+    Returns:
+        Int: The number of rounds that made a deduction, or None if the domains
+        turned out to be contradictory.
+    """
+    depth = 0
+    while True:
+        snapshot = list(domains)
+        for cells, counts in lines:
+            for color in range(n_colors):
+                bit = 1 << color
+                fixed = [c for c in cells if snapshot[c] == bit]
+                possible = [c for c in cells if snapshot[c] & bit]
+                if len(fixed) > counts[color] or len(possible) < counts[color]:
+                    return None
+                if len(possible) == len(fixed):
+                    continue
+                if len(fixed) == counts[color]:
+                    for c in possible:
+                        if snapshot[c] != bit:
+                            domains[c] &= ~bit
+                elif len(possible) == counts[color]:
+                    for c in possible:
+                        domains[c] &= bit
+        if 0 in domains:
+            return None
+        if domains == snapshot:
+            return depth
+        depth += 1
+
+
+def count_solutions(domains, lines, n_colors, limit=None, stats=None, stop=None):
+    """Counts the solutions reachable from the given domains by propagation and branching.
+
+    The search branches on the undecided cell with the fewest remaining colors.
+
+    Args:
+        domains (list): Bitmask of the possible colors of each cell. It is not modified.
+        lines (list): The line constraints as returned by build_lines.
+        n_colors (int): The number of colors, including 'blank'.
+        limit (int): Stop searching once this many solutions have been found (default: no limit).
+        stats (dict): Optional dictionary in which 'depth' (deepest propagation) and
+            'branches' (number of guesses) are accumulated.
+        stop (callable): Optional function that is polled before every propagation; once
+            it returns True the search is abandoned and the solutions found so far are returned.
+
+    Returns:
+        Int: The number of solutions found, at most limit.
+    """
+    if stop is not None and stop():
+        return 0
+    domains = list(domains)
+    depth = propagate(domains, lines, n_colors)
+    if depth is None:
+        return 0
+    if stats is not None:
+        stats['depth'] = max(stats.get('depth', 0), depth)
+
+    open_cells = [c for c in range(len(domains)) if domains[c] & (domains[c] - 1)]
+    if not open_cells:
+        return 1
+
+    cell = min(open_cells, key=lambda c: bin(domains[c]).count("1"))
+    found = 0
+    for color in range(n_colors):
+        if domains[cell] & (1 << color):
+            if stats is not None:
+                stats['branches'] = stats.get('branches', 0) + 1
+            branch = list(domains)
+            branch[cell] = 1 << color
+            found += count_solutions(branch, lines, n_colors, None if limit is None else limit - found, stats, stop)
+            if limit is not None and found >= limit:
+                break
+    return found
+
+
+def rate_puzzle(row_sums, col_sums):
+    """Solves a puzzle from its clues and records how hard that was.
+
+    Args:
+        row_sums (list): Number of each color (excluding 'blank') in each row.
+        col_sums (list): Number of each color (excluding 'blank') in each column.
+
+    Returns:
+        Dict: The propagation 'depth', the number of 'branches' needed, the number of
+        'solutions' found (capped at 2) and the 'solve_time' in seconds.
+    """
+    n_colors = len(row_sums[0]) + 1
+    k = len(row_sums)
+    lines = build_lines(row_sums, col_sums)
+    stats = {'depth': 0, 'branches': 0}
+    start = time.perf_counter()
+    stats['solutions'] = count_solutions([(1 << n_colors) - 1] * (k*k), lines, n_colors, limit=2, stats=stats)
+    stats['solve_time'] = time.perf_counter() - start
+    return stats
@@ -0,0 +1,159 @@
+import argparse
+import multiprocessing
+import os
+
+from utils import COLORS, generate_new_puzzle
+from solver import build_lines, propagate, count_solutions
+
+# Instances whose solution count already reached the limit, shared with the workers
+_cancelled = None
+
+
+def _init_worker(cancelled):
+    global _cancelled
+    _cancelled = cancelled
+
+
+def row_assignments(domains, cells, counts, pos=0):
+    """Enumerates the ways to fill a line that respect both the domains and the color counts.
+
+    Args:
+        domains (list): Bitmask of the possible colors of each cell.
+        cells (list): The cell indices of the line.
+        counts (list): The required count of each color (including 'blank') in the line.
+        pos (int): The position in the line from which on cells are still to be filled.
+
+    Yields:
+        List: The color of each cell of the line, from position pos onwards.
+    """
+    if pos == len(cells):
+        yield []
+        return
+    for color, count in enumerate(counts):
+        if count > 0 and domains[cells[pos]] & (1 << color):
+            counts[color] -= 1
+            for rest in row_assignments(domains, cells, counts, pos + 1):
+                yield [color] + rest
+            counts[color] += 1
+
+
+def split_search(row_sums, col_sums, split_rows=1):
+    """Splits the search tree of a puzzle into independent subtrees by fixing its first rows.
+
+    Args:
+        row_sums (list): Number of each color (excluding 'blank') in each row.
+        col_sums (list): Number of each color (excluding 'blank') in each column.
+        split_rows (int): The number of rows to fix in every subtree, at most all of them.
+
+    Returns:
+        List: The domains of every subtree that survives propagation. Together the
+        subtrees hold exactly the solutions of the puzzle.
+    """
+    n_colors = len(COLORS)
+    lines = build_lines(row_sums, col_sums)
+    domains = [(1 << n_colors) - 1] * (len(row_sums)**2)
+    if propagate(domains, lines, n_colors) is None:
+        return []
+
+    subtrees = [domains]
+    for cells, counts in lines[:min(split_rows, len(row_sums))]:
+        next_subtrees = []
+        for domains in subtrees:
+            for assignment in row_assignments(domains, cells, list(counts)):
+                branch = list(domains)
+                for cell, color in zip(cells, assignment):
+                    branch[cell] = 1 << color
+                if propagate(branch, lines, n_colors) is not None:
+                    next_subtrees.append(branch)
+        subtrees = next_subtrees
+    return subtrees
+
+
+def _count_subtree(task):
+    instance, domains, row_sums, col_sums, limit = task
+    # Abandon the subtree as soon as its instance has been decided elsewhere
+    stop = lambda: _cancelled[instance]
+    return instance, count_solutions(domains, build_lines(row_sums, col_sums), len(COLORS), limit, stop=stop)
+
+
+def _generate_clues(k):
+    return generate_new_puzzle(k)[1:]
+
+
+def count_solutions_parallel(puzzles, limit=2, split_rows=1, processes=None):
+    """Counts the solutions of several puzzles, searching their subtrees on a process pool.
+
+    The count of a puzzle stops at limit. Once the limit is reached, its queued subtrees
+    are skipped and the searches still running on them are abandoned.
+
+    Args:
+        puzzles (list): A list of (row_sums, col_sums) tuples.
+        limit (int): The number of solutions after which counting stops (default: 2,
+            which is enough to tell whether a puzzle is unique).
+        split_rows (int): The number of rows fixed in every subtree (default: 1).
+        processes (int): The number of worker processes (default: the number of CPUs).
+
+    Returns:
+        List: The number of solutions of each puzzle, capped at limit.
+    """
+    cancelled = multiprocessing.Array('b', len(puzzles), lock=False)
+    tasks = [
+        (instance, domains, row_sums, col_sums, limit)
+        for instance, (row_sums, col_sums) in enumerate(puzzles)
+        for domains in split_search(row_sums, col_sums, split_rows)
+    ]
+
+    counts = [0]*len(puzzles)
+    with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(cancelled,)) as pool:
+        for instance, found in pool.imap_unordered(_count_subtree, tasks, chunksize=1):
+            counts[instance] = min(limit, counts[instance] + found)
+            if counts[instance] >= limit:
+                cancelled[instance] = 1
+    return counts
+
+
+def non_uniqueness_rate(k, samples, limit=2, split_rows=1, processes=None):
+    """Estimates how often the generator emits puzzles of size k with more than one solution.
+
+    Args:
+        k (int): The size of the puzzles (k x k).
+        samples (int): The number of puzzles to generate.
+        limit (int): The number of solutions after which counting stops (default: 2).
+        split_rows (int): The number of rows fixed in every subtree (default: 1).
+        processes (int): The number of worker processes (default: the number of CPUs).
+
+    Returns:
+        Tuple: The fraction of non-unique puzzles and the solution count of each puzzle.
+    """
+    if samples < 1:
+        raise ValueError("samples must be at least 1")
+
+    # Generating large boards can take much longer than checking them, so it is parallelized as well
+    with multiprocessing.Pool(processes) as pool:
+        puzzles = pool.map(_generate_clues, [k]*samples, chunksize=1)
+    counts = count_solutions_parallel(puzzles, limit, split_rows, processes)
+    return sum(count > 1 for count in counts) / samples, counts
+
+
+def _positive_int(value):
+    value = int(value)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"{value} is not a positive integer")
+    return value
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Report how often generated puzzles have more than one solution.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(range(2, 11)), help="board sizes to sample")
+    parser.add_argument('--samples', type=_positive_int, default=100, help="puzzles to generate per size")
+    parser.add_argument('--limit', type=_positive_int, default=2, help="stop counting the solutions of a puzzle at this number")
+    parser.add_argument('--split-rows', type=_positive_int, default=1, help="rows fixed when splitting the search tree")
+    parser.add_argument('--processes', type=_positive_int, default=os.cpu_count(), help="number of worker processes")
+    args = parser.parse_args()
+    if args.split_rows > min(args.sizes):
+        parser.error(f"--split-rows cannot exceed the smallest board size ({min(args.sizes)})")
+
+    for k in args.sizes:
+        rate, counts = non_uniqueness_rate(k, args.samples, args.limit, args.split_rows, args.processes)
+        print(f"{k}x{k}: {rate:.1%} non-unique ({sum(count > 1 for count in counts)}/{args.samples}), "
+              f"max solutions counted: {max(counts)}")